@@ -1,11 +1,22 @@
+import asyncio
 import boto3
+import functools
+import hashlib
 import os
 import subprocess
 import tempfile
 import time
 import json
+import wave
+import diskcache
+import ijson
 import requests
+import botocore.config
+from amazon_transcribe.client import TranscribeStreamingClient
+from amazon_transcribe.model import TranscriptEvent
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import re
 
@@ -22,17 +33,63 @@ TARGET_BUCKET = SOURCE_BUCKET  # Same bucket
 # TARGET_VIDEO = input("Enter the target video name: ")
 TARGET_VIDEO = 'OnTheJob Demo2 dutch.mp4'
 
+# Multipart transfer tuning for video-sized objects: larger parts and more
+# concurrent connections than the boto3 defaults, with a connection pool big
+# enough that parallel parts don't queue on a free connection
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=50 * 1024 * 1024,
+    max_concurrency=32,
+    use_threads=True
+)
+_BOTO_CONFIG = botocore.config.Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
 # AWS credentials will be loaded from environment variables, AWS config, or instance role
-s3_client = boto3.client('s3')
+s3_client = boto3.client('s3', config=_BOTO_CONFIG)
 transcribe_client = boto3.client('transcribe')
 translate_client = boto3.client('translate')
 polly_client = boto3.client('polly')
 
+# On-disk cache for Translate and Polly responses. Both services are pure
+# functions of their input text, so identical text across runs (common while
+# debugging) can skip the API call entirely. Bump the version to invalidate.
+_CACHE_VERSION = 'v1'
+response_cache = diskcache.Cache(os.path.join(tempfile.gettempdir(), 'vlc_cache'))
+
+def _cache_key(prefix, *parts):
+    """Build a versioned cache key from a content hash of the given parts"""
+    digest = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+    return f"{prefix}:{_CACHE_VERSION}:{digest}"
+
+def _file_md5(path):
+    """Hex MD5 of a file, read in 1 MiB chunks"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def download_from_s3(bucket, key, local_path):
     """Download a file from S3 to local storage"""
     try:
+        # One cheap HEAD surfaces missing-object and permission errors before
+        # any transfer starts, and lets warm-cache runs skip the download when
+        # a local copy of the same content already exists
+        head = s3_client.head_object(Bucket=bucket, Key=key)
+        if os.path.exists(local_path) and os.path.getsize(local_path) == head['ContentLength']:
+            # Only trust the shortcut when the content can be verified: for
+            # non-multipart uploads the ETag is the object's MD5 (multipart
+            # ETags contain a '-' and are not, so those always re-download)
+            etag = head.get('ETag', '').strip('"')
+            if etag and '-' not in etag and _file_md5(local_path) == etag:
+                logger.info(f"Local copy of {key} matches S3 object ETag, skipping download")
+                return True
+
         logger.info(f"Downloading {key} from S3 bucket {bucket}")
-        s3_client.download_file(bucket, key, local_path)
+        s3_client.download_file(bucket, key, local_path, Config=_TRANSFER_CONFIG)
         return True
     except ClientError as e:
         logger.error(f"Error downloading from S3: {e}")
@@ -42,7 +99,7 @@ def upload_to_s3(local_path, bucket, key):
     """Upload a file to S3 from local storage"""
     try:
         logger.info(f"Uploading to S3: {bucket}/{key}")
-        s3_client.upload_file(local_path, bucket, key)
+        s3_client.upload_file(local_path, bucket, key, Config=_TRANSFER_CONFIG)
         return True
     except ClientError as e:
         logger.error(f"Error uploading to S3: {e}")
@@ -52,10 +109,15 @@ def extract_audio(video_path, audio_path):
     """Extract audio from video file using FFmpeg"""
     try:
         logger.info(f"Extracting audio from video: {video_path} to {audio_path}")
+        # Map the audio stream explicitly and disable the video/subtitle/data
+        # branches so ffmpeg doesn't spend cycles probing or decoding them
         command = [
-            'ffmpeg', '-i', video_path, 
-            '-vn', '-acodec', 'pcm_s16le', 
-            '-ar', '16000', '-ac', '1', 
+            'ffmpeg', '-loglevel', 'error', '-nostdin',
+            '-i', video_path,
+            '-map', '0:a:0', '-vn', '-sn', '-dn',
+            '-acodec', 'pcm_s16le',
+            '-ar', '16000', '-ac', '1',
+            '-threads', '0',
             audio_path, '-y'
         ]
         subprocess.run(command, check=True)
@@ -74,31 +136,187 @@ def extract_audio(video_path, audio_path):
         logger.error("FFmpeg not found. Please install FFmpeg and ensure it's in your PATH.")
         return False
 
+def extract_audio_from_s3(bucket, key, audio_path):
+    """Extract the audio track directly from a video in S3 via a presigned URL
+
+    ffmpeg reads the object over HTTP range requests, so for moov-atom-first
+    mp4 files only the audio track is fetched — the video-frame bytes (the
+    vast majority of the file) never cross the wire.
+    """
+    try:
+        url = s3_client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': bucket, 'Key': key},
+            ExpiresIn=3600
+        )
+        logger.info(f"Extracting audio directly from s3://{bucket}/{key}")
+        command = [
+            'ffmpeg', '-loglevel', 'error', '-nostdin',
+            '-i', url,
+            '-map', '0:a:0', '-vn', '-sn', '-dn',
+            '-acodec', 'pcm_s16le',
+            '-ar', '16000', '-ac', '1',
+            '-threads', '0',
+            audio_path, '-y'
+        ]
+        subprocess.run(command, check=True)
+
+        if os.path.exists(audio_path):
+            logger.info(f"Audio extraction from S3 successful: {audio_path}")
+            return True
+        else:
+            logger.error(f"Audio file not created: {audio_path}")
+            return False
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error extracting audio from S3 with FFmpeg: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"Error extracting audio from S3: {e}")
+        return False
+
 def get_video_duration(video_path):
-    """Get video duration using FFmpeg"""
+    """Get video duration from the container header using ffprobe"""
     try:
         logger.info(f"Getting duration for video: {video_path}")
+        # ffprobe reads only the container metadata, unlike decoding the whole
+        # file with `ffmpeg -f null -` just to print a duration line
         command = [
-            'ffmpeg', '-i', video_path, 
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'json',
+            video_path
+        ]
+        result = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+        duration = float(json.loads(result.stdout)['format']['duration'])
+        logger.info(f"Video duration: {duration} seconds")
+        return duration
+    except Exception as e:
+        logger.error(f"Error getting video duration with ffprobe: {e}")
+        return _get_video_duration_ffmpeg(video_path)
+
+# Compiled once; matches ffmpeg's "Duration: HH:MM:SS.ss" banner line and is
+# more tolerant of formatting differences between ffmpeg versions than
+# chained str.split calls
+_DURATION_RE = re.compile(r'Duration:\s*(\d+):(\d+):([\d.]+)')
+
+def _get_video_duration_ffmpeg(video_path):
+    """Fallback duration probe that parses ffmpeg's stderr banner"""
+    try:
+        command = [
+            'ffmpeg', '-i', video_path,
             '-f', 'null', '-'
         ]
         result = subprocess.run(command, stderr=subprocess.PIPE, text=True)
-        
+
         # Extract duration from FFmpeg output
-        for line in result.stderr.split('\n'):
-            if 'Duration' in line:
-                time_str = line.split('Duration: ')[1].split(',')[0]
-                h, m, s = time_str.split(':')
-                duration = float(h) * 3600 + float(m) * 60 + float(s)
+        for line in result.stderr.splitlines():
+            match = _DURATION_RE.search(line)
+            if match:
+                h, m, s = match.groups()
+                duration = int(h) * 3600 + int(m) * 60 + float(s)
                 logger.info(f"Video duration: {duration} seconds")
                 return duration
-        
+
         logger.error("Could not determine video duration")
         return 60.0  # Default to 60 seconds if duration can't be determined
     except Exception as e:
         logger.error(f"Error getting video duration: {e}")
         return 60.0  # Default to 60 seconds if there's an error
 
+def _stream_parse_transcript(transcript_uri):
+    """Stream-parse a batch transcript JSON without materializing the document
+
+    Long videos produce transcripts with thousands of items; ijson walks the
+    HTTP stream and only builds the transcript string and the item dicts, so
+    the raw JSON bytes and the full parsed document never coexist in memory.
+    """
+    with requests.get(transcript_uri, stream=True) as response:
+        response.raise_for_status()
+
+        transcript_text = None
+        items = []
+        builder = None
+
+        for prefix, event, value in ijson.parse(response.raw):
+            if prefix == 'results.transcripts.item.transcript' and transcript_text is None:
+                transcript_text = value
+            elif prefix == 'results.items.item' and event == 'start_map':
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix == 'results.items.item' and event == 'end_map':
+                builder.event(event, value)
+                items.append(builder.value)
+                builder = None
+            elif builder is not None and prefix.startswith('results.items.item'):
+                builder.event(event, value)
+
+    return transcript_text, items
+
+def _streaming_item_to_batch_dict(item):
+    """Convert a streaming transcript item to the batch transcript dict shape
+
+    The batch API returns items as JSON dicts with string-typed times and
+    confidences; the streaming SDK returns Item objects. Callers of
+    transcribe_audio should see the same shape from either backend.
+    """
+    converted = {
+        'type': item.item_type,
+        'alternatives': [{
+            'content': item.content,
+            'confidence': str(item.confidence) if item.confidence is not None else '0.0'
+        }]
+    }
+    # Punctuation items carry no timing in the batch format either
+    if item.start_time is not None:
+        converted['start_time'] = str(item.start_time)
+    if item.end_time is not None:
+        converted['end_time'] = str(item.end_time)
+    return converted
+
+async def _stream_transcription(audio_path):
+    """Transcribe a WAV file with Amazon Transcribe streaming
+
+    Results arrive while the audio is still being sent, so there is no S3
+    upload, no transcription job to poll, and no transcript file to fetch.
+    Returns (transcript_text, items) like the batch path.
+    """
+    with wave.open(audio_path, 'rb') as wav_file:
+        sample_rate = wav_file.getframerate()
+
+        client = TranscribeStreamingClient(region=transcribe_client.meta.region_name)
+        stream = await client.start_stream_transcription(
+            language_code='en-US',
+            media_sample_rate_hz=sample_rate,
+            media_encoding='pcm'
+        )
+
+        async def send_audio():
+            while True:
+                frames = wav_file.readframes(4096)
+                if not frames:
+                    break
+                await stream.input_stream.send_audio_event(audio_chunk=frames)
+            await stream.input_stream.end_stream()
+
+        transcript_parts = []
+        items = []
+
+        async def receive_results():
+            async for event in stream.output_stream:
+                if not isinstance(event, TranscriptEvent):
+                    continue
+                for result in event.transcript.results:
+                    if result.is_partial:
+                        continue
+                    for alternative in result.alternatives:
+                        transcript_parts.append(alternative.transcript)
+                        if alternative.items:
+                            items.extend(_streaming_item_to_batch_dict(item) for item in alternative.items)
+
+        await asyncio.gather(send_audio(), receive_results())
+
+    return ' '.join(transcript_parts), items
+
 def transcribe_audio(audio_path, job_name):
     """Transcribe audio using Amazon Transcribe"""
     try:
@@ -106,9 +324,20 @@ def transcribe_audio(audio_path, job_name):
         if not os.path.exists(audio_path):
             logger.error(f"Audio file not found: {audio_path}")
             return None, None
-            
+
         logger.info(f"Transcribing audio: {audio_path}")
-        
+
+        # Try streaming transcription first; it avoids the S3 round-trip and
+        # the job-queue wait of the batch API entirely
+        try:
+            transcript_text, items = asyncio.run(_stream_transcription(audio_path))
+            if transcript_text:
+                logger.info(f"Transcript text: {transcript_text[:100]}...")
+                return transcript_text, items
+            logger.warning("Streaming transcription returned no text, falling back to batch job")
+        except Exception as e:
+            logger.warning(f"Streaming transcription failed ({e}), falling back to batch job")
+
         # Upload audio to S3 for transcription
         audio_s3_key = f"temp/{job_name}.wav"
         if not upload_to_s3(audio_path, SOURCE_BUCKET, audio_s3_key):
@@ -124,29 +353,33 @@ def transcribe_audio(audio_path, job_name):
             LanguageCode='en-US'
         )
         
-        # Wait for the transcription job to complete
+        # Wait for the transcription job to complete, polling with exponential
+        # backoff so short jobs finish fast and long jobs make fewer API calls
+        delay = 1.0
         while True:
             status = transcribe_client.get_transcription_job(TranscriptionJobName=job_name)
             if status['TranscriptionJob']['TranscriptionJobStatus'] in ['COMPLETED', 'FAILED']:
                 break
-            logger.info("Waiting for transcription to complete...")
-            time.sleep(5)
+            logger.info(f"Waiting for transcription to complete (next check in {delay:.1f}s)...")
+            time.sleep(delay)
+            delay = min(delay * 1.5, 10.0)
         
         if status['TranscriptionJob']['TranscriptionJobStatus'] == 'COMPLETED':
             transcript_uri = status['TranscriptionJob']['Transcript']['TranscriptFileUri']
             logger.info(f"Transcription completed. Downloading transcript from: {transcript_uri}")
-            
-            # Download the transcript JSON
-            response = requests.get(transcript_uri)
-            transcript_data = response.json()
-            
-            # Extract the transcript text
-            transcript_text = transcript_data['results']['transcripts'][0]['transcript']
+
+            # Stream-parse the transcript JSON; fall back to an in-memory
+            # parse if the incremental parser trips on anything
+            try:
+                transcript_text, items = _stream_parse_transcript(transcript_uri)
+            except Exception as e:
+                logger.warning(f"Streaming transcript parse failed ({e}), parsing in memory")
+                transcript_data = requests.get(transcript_uri).json()
+                transcript_text = transcript_data['results']['transcripts'][0]['transcript']
+                items = transcript_data['results']['items']
+
             logger.info(f"Transcript text: {transcript_text[:100]}...")
-            
-            # Get the time-aligned words
-            items = transcript_data['results']['items']
-            
+
             return transcript_text, items
         else:
             logger.error("Transcription job failed")
@@ -160,12 +393,18 @@ def translate_text(text, source_lang='en', target_lang='nl'):
     """Translate text from source language to target language"""
     try:
         logger.info(f"Translating text from {source_lang} to {target_lang}")
-        
+
+        cache_key = _cache_key('translate', source_lang, target_lang, text)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Translation found in cache, skipping API call")
+            return cached
+
         # Split text into chunks if it's too long (Amazon Translate has a character limit)
         if len(text) > 5000:
             chunks = [text[i:i+5000] for i in range(0, len(text), 5000)]
             translated_chunks = []
-            
+
             for chunk in chunks:
                 response = translate_client.translate_text(
                     Text=chunk,
@@ -173,57 +412,65 @@ def translate_text(text, source_lang='en', target_lang='nl'):
                     TargetLanguageCode=target_lang
                 )
                 translated_chunks.append(response['TranslatedText'])
-            
-            return ' '.join(translated_chunks)
+
+            translated = ' '.join(translated_chunks)
         else:
             response = translate_client.translate_text(
                 Text=text,
                 SourceLanguageCode=source_lang,
                 TargetLanguageCode=target_lang
             )
-            return response['TranslatedText']
+            translated = response['TranslatedText']
+
+        response_cache.set(cache_key, translated)
+        return translated
     except Exception as e:
         logger.error(f"Error translating text: {e}")
         return None
 
+@functools.lru_cache(maxsize=16)
+def _pick_female_voice(language_code='nl-NL'):
+    """Find a female Polly voice for the language, cached after the first call
+
+    The available voices never change within a run, so the describe_voices
+    round-trip only needs to happen once rather than per synthesis.
+    """
+    available_voices = polly_client.describe_voices(LanguageCode=language_code)
+
+    for voice in available_voices['Voices']:
+        if voice['Gender'] == 'Female':
+            logger.info(f"Selected {language_code} female voice: {voice['Id']}")
+            return voice['Id']
+
+    # If no female voice found, fall back to a standard voice
+    logger.warning("No suitable female voice found, using default: Lotte")
+    return 'Lotte'
+
 def synthesize_speech(text, output_path):
     """Synthesize speech using Amazon Polly"""
     try:
         logger.info(f"Synthesizing speech to {output_path}")
-        
+
         # Clean up the text for better synthesis
         text = text.strip()
         if not text:
             logger.warning("Empty text provided for speech synthesis")
             return False
-        
-        # First, get available voices for Dutch
-        available_voices = polly_client.describe_voices(LanguageCode='nl-NL')
-        
-        # Find a suitable female voice
-        voice_id = None
-        for voice in available_voices['Voices']:
-            if voice['Gender'] == 'Female':
-                voice_id = voice['Id']
-                logger.info(f"Selected Dutch female voice: {voice_id}")
-                break
-        
-        # If no Dutch female voice found, try a standard voice
-        if not voice_id:
-            voice_id = 'Lotte'  # Default to Lotte but with standard engine
-            logger.warning(f"No suitable Dutch female voice found, using default: {voice_id}")
-        
+
+        voice_id = _pick_female_voice('nl-NL')
+
+        cache_key = _cache_key('polly', voice_id, text)
+        audio_bytes = response_cache.get(cache_key)
+        if audio_bytes is not None:
+            logger.info("Synthesized speech found in cache, skipping API call")
         # Amazon Polly has a character limit, so handle longer text
-        if len(text) > 1500:
+        elif len(text) > 1500:
             # Split into chunks
             chunks = [text[i:i+1500] for i in range(0, len(text), 1500)]
-            
-            # Create a temporary file for each chunk
-            temp_files = []
-            for i, chunk in enumerate(chunks):
-                temp_output = f"{output_path}.part{i}.mp3"
-                
-                # Synthesize each chunk
+
+            # Synthesize the chunks in parallel; Polly calls are I/O bound and
+            # boto3 clients are safe to share across threads
+            def synthesize_chunk(chunk):
                 response = polly_client.synthesize_speech(
                     Text=chunk,
                     OutputFormat='mp3',
@@ -231,25 +478,18 @@ def synthesize_speech(text, output_path):
                     # Use standard engine instead of neural
                     LanguageCode='nl-NL'
                 )
-                
-                # Save the audio stream to a file
-                with open(temp_output, 'wb') as file:
-                    file.write(response['AudioStream'].read())
-                
-                temp_files.append(temp_output)
-            
-            # Combine the temporary files
-            with open(output_path, 'wb') as outfile:
-                for temp_file in temp_files:
-                    with open(temp_file, 'rb') as infile:
-                        outfile.write(infile.read())
-            
-            # Clean up temporary files
-            for temp_file in temp_files:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
+                return response['AudioStream'].read()
+
+            with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
+                audio_parts = list(executor.map(synthesize_chunk, chunks))
+
+            # Concatenate the chunks in their original order
+            audio_bytes = b''.join(audio_parts)
+            response_cache.set(cache_key, audio_bytes)
         else:
-            # For shorter text, synthesize directly
+            # For shorter text, synthesize directly and tee the response to
+            # disk in 1 MiB chunks, collecting the same chunks for the cache
+            # so the file is never read back and only one copy sits in memory
             response = polly_client.synthesize_speech(
                 Text=text,
                 OutputFormat='mp3',
@@ -257,10 +497,24 @@ def synthesize_speech(text, output_path):
                 # Use standard engine instead of neural
                 LanguageCode='nl-NL'
             )
-            
-            # Save the audio stream to a file
+
+            stream = response['AudioStream']
+            collected = bytearray()
+            with open(output_path, 'wb') as file:
+                while True:
+                    chunk = stream.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    file.write(chunk)
+                    collected.extend(chunk)
+
+            response_cache.set(cache_key, bytes(collected))
+            audio_bytes = None
+
+        # Save the audio to a file (the streaming path above already wrote it)
+        if audio_bytes is not None:
             with open(output_path, 'wb') as file:
-                file.write(response['AudioStream'].read())
+                file.write(audio_bytes)
         
         # Verify the file exists
         if os.path.exists(output_path):
@@ -326,20 +580,29 @@ def combine_audio_with_video(video_path, audio_path, output_path):
             logger.error(f"Audio file not found: {audio_path}")
             return False
             
-        command = [
-            'ffmpeg',
-            '-i', video_path,
-            '-i', audio_path,
-            '-c:v', 'copy',
-            '-c:a', 'aac',
-            '-map', '0:v:0',
-            '-map', '1:a:0',
-            '-shortest',
-            output_path,
-            '-y'
-        ]
-        subprocess.run(command, check=True)
-        
+        # Try muxing the audio with stream copy first: mp4 supports mp3 audio,
+        # and copying skips a full decode+encode pass over the whole track.
+        # Fall back to aac re-encoding for players that insist on it.
+        def build_command(*audio_options):
+            return [
+                'ffmpeg',
+                '-i', video_path,
+                '-i', audio_path,
+                '-c:v', 'copy',
+                *audio_options,
+                '-map', '0:v:0',
+                '-map', '1:a:0',
+                '-shortest',
+                '-movflags', '+faststart',
+                output_path,
+                '-y'
+            ]
+
+        result = subprocess.run(build_command('-c:a', 'copy'))
+        if result.returncode != 0:
+            logger.warning("Audio stream copy failed, re-encoding to aac")
+            subprocess.run(build_command('-c:a', 'aac', '-b:a', '128k', '-threads', '0'), check=True)
+
         # Verify the output file exists
         if os.path.exists(output_path):
             logger.info(f"Successfully combined audio and video: {output_path}")
@@ -362,32 +625,46 @@ def main():
             audio_path = os.path.join(temp_dir, "extracted_audio.wav")
             output_video_path = os.path.join(temp_dir, TARGET_VIDEO)
             
-            # Step 1: Download the video from S3
-            if not download_from_s3(SOURCE_BUCKET, SOURCE_VIDEO, video_path):
-                logger.error("Failed to download video from S3")
-                return
-                
-            # Verify the video file exists
-            if not os.path.exists(video_path):
-                logger.error(f"Downloaded video file not found: {video_path}")
-                return
-                
-            # Step 2: Extract audio from the video
-            if not extract_audio(video_path, audio_path):
-                logger.error("Failed to extract audio from video")
-                return
-                
-            # Step 3: Simplified approach - translate and synthesize the entire transcript
-            dutch_audio_path = simple_translate_and_synthesize(temp_dir)
-            if not dutch_audio_path:
-                logger.error("Failed to generate Dutch audio")
-                return
-                
-            # Step 4: Combine the Dutch audio with the original video
-            if not combine_audio_with_video(video_path, dutch_audio_path, output_video_path):
-                logger.error("Failed to combine audio with video")
-                return
-                
+            # The stages form a DAG rather than a chain: the full download and
+            # the audio branch (extract -> transcribe -> translate ->
+            # synthesize) only meet again at the combine step, so the two
+            # branches run as futures and the wall clock approaches the
+            # critical path instead of the sum of all stages
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                download_future = executor.submit(download_from_s3, SOURCE_BUCKET, SOURCE_VIDEO, video_path)
+                audio_future = executor.submit(extract_audio_from_s3, SOURCE_BUCKET, SOURCE_VIDEO, audio_path)
+
+                # Fall back to extracting from the downloaded video if the
+                # direct-from-S3 extraction fails
+                if not audio_future.result():
+                    logger.warning("Direct audio extraction from S3 failed, extracting from the downloaded video")
+
+                    if not download_future.result() or not os.path.exists(video_path):
+                        logger.error("Failed to download video from S3")
+                        return
+
+                    if not extract_audio(video_path, audio_path):
+                        logger.error("Failed to extract audio from video")
+                        return
+
+                # The audio is ready, so the transcribe/translate/synthesize
+                # chain can run while the download branch finishes
+                dutch_future = executor.submit(simple_translate_and_synthesize, temp_dir)
+
+                dutch_audio_path = dutch_future.result()
+                if not dutch_audio_path:
+                    logger.error("Failed to generate Dutch audio")
+                    return
+
+                # Combine joins both branches
+                if not download_future.result() or not os.path.exists(video_path):
+                    logger.error("Failed to download video from S3")
+                    return
+
+                if not combine_audio_with_video(video_path, dutch_audio_path, output_video_path):
+                    logger.error("Failed to combine audio with video")
+                    return
+
             # Step 5: Upload the result to S3
             if not upload_to_s3(output_video_path, TARGET_BUCKET, TARGET_VIDEO):
                 logger.error("Failed to upload result to S3")
@@ -1,9 +1,18 @@
+import asyncio
 import boto3
+import numpy as np
 import pysrt
+import diskcache
+import hashlib
 import os
+import re
+import subprocess
 import tempfile
 from datetime import datetime, timedelta
 import time
+from aiobotocore.session import get_session
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor
 from pydub import AudioSegment
 import urllib3
 import logging
@@ -13,33 +22,47 @@ import botocore.config
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def create_boto3_client(service_name):
-    """Create a boto3 client with proper configuration to avoid SSL issues"""
-    # Configure boto3 with appropriate retry settings and timeout settings
-    config = botocore.config.Config(
-        retries={
-            'max_attempts': 10,
-            'mode': 'standard'
-        },
-        connect_timeout=60,
-        read_timeout=60
-    )
-    
-    # Create client with the custom config
-    return boto3.client(
-        service_name,
-        config=config,
-        # Use SigV4 signing which is more reliable
-        # You can remove these lines if you're using AWS credentials from environment or ~/.aws/
-        # use_ssl=True,
-        # verify=True
-    )
+# On-disk cache for Translate and Polly responses. Both services are pure
+# functions of their input text, so recurring subtitle lines and repeat runs
+# (common while debugging) skip the API call. Bump the version to invalidate.
+_CACHE_VERSION = 'v1'
+response_cache = diskcache.Cache(os.path.join(tempfile.gettempdir(), 'vlc_cache'))
+
+def _cache_key(prefix, *parts):
+    """Build a versioned cache key from a content hash of the given parts"""
+    digest = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+    return f"{prefix}:{_CACHE_VERSION}:{digest}"
+
+# Multipart transfer tuning: larger parts and more concurrent connections
+# than the boto3 defaults, for the audio files this script moves around
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=50 * 1024 * 1024,
+    max_concurrency=32,
+    use_threads=True
+)
+
+# One session and one client per service, created at import and shared across
+# all threads (boto3 clients are thread-safe). Creating a client per call
+# re-reads config and re-resolves endpoints for every subtitle.
+_CLIENT_CONFIG = botocore.config.Config(
+    retries={
+        'max_attempts': 10,
+        'mode': 'adaptive'
+    },
+    connect_timeout=10,
+    read_timeout=60,
+    max_pool_connections=64
+)
+_SESSION = boto3.Session()
+s3_client = _SESSION.client('s3', config=_CLIENT_CONFIG)
+translate_client = _SESSION.client('translate', config=_CLIENT_CONFIG)
+polly_client = _SESSION.client('polly', config=_CLIENT_CONFIG)
 
 def download_srt_from_s3(bucket_name, srt_key, local_file_path):
     """Download SRT file from S3 bucket with error handling"""
     try:
-        s3_client = create_boto3_client('s3')
-        s3_client.download_file(bucket_name, srt_key, local_file_path)
+        s3_client.download_file(bucket_name, srt_key, local_file_path, Config=_TRANSFER_CONFIG)
         logger.info(f"Downloaded SRT file from s3://{bucket_name}/{srt_key} to {local_file_path}")
         return True
     except Exception as e:
@@ -49,14 +72,13 @@ def download_srt_from_s3(bucket_name, srt_key, local_file_path):
 def upload_to_s3(bucket_name, file_path, s3_key):
     """Upload a file to S3 bucket with error handling"""
     try:
-        s3_client = create_boto3_client('s3')
-        
         # Use ExtraArgs to ensure proper content type
         s3_client.upload_file(
-            file_path, 
-            bucket_name, 
+            file_path,
+            bucket_name,
             s3_key,
-            ExtraArgs={'ContentType': 'audio/mpeg'}
+            ExtraArgs={'ContentType': 'audio/mpeg'},
+            Config=_TRANSFER_CONFIG
         )
         logger.info(f"Uploaded {file_path} to s3://{bucket_name}/{s3_key}")
         return True
@@ -67,37 +89,211 @@ def upload_to_s3(bucket_name, file_path, s3_key):
 def translate_text(text, target_language='nl'):
     """Translate text to target language using Amazon Translate"""
     try:
-        translate_client = create_boto3_client('translate')
+        cache_key = _cache_key('translate', 'auto', target_language, text)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         response = translate_client.translate_text(
             Text=text,
             SourceLanguageCode='auto',
             TargetLanguageCode=target_language
         )
+        response_cache.set(cache_key, response['TranslatedText'])
         return response['TranslatedText']
     except Exception as e:
         logger.error(f"Error translating text: {str(e)}")
         # Return original text if translation fails
         return text
 
-def generate_speech(text, output_file, voice_id='Lotte'):
-    """Generate speech from text using Amazon Polly"""
+# Sentinel used to join several short texts into one Translate request; it
+# survives translation intact so the response can be split back into segments
+_SEGMENT_SEPARATOR = "\n<SEG>\n"
+_SEGMENT_SPLIT_RE = re.compile(r'\s*<SEG>\s*')
+_MAX_PACK_CHARS = 4800  # stay under Amazon Translate's 5000-char limit
+
+def translate_texts(texts, target_language='nl'):
+    """Translate a list of texts, batching several per API call
+
+    Short texts are greedily packed into requests near the Translate character
+    limit, separated by a sentinel token, so per-request latency is amortized
+    over many segments. If the translated response does not split back into
+    the expected number of segments, that pack falls back to per-text calls.
+    """
+    translated = []
+    pack = []
+    pack_chars = 0
+
+    def flush_pack():
+        if not pack:
+            return
+        response = translate_text(_SEGMENT_SEPARATOR.join(pack), target_language)
+        parts = _SEGMENT_SPLIT_RE.split(response)
+        if len(parts) == len(pack):
+            translated.extend(part.strip() for part in parts)
+        else:
+            logger.warning(
+                f"Batched translation returned {len(parts)} segments for {len(pack)} inputs; "
+                "retrying this pack one text at a time"
+            )
+            translated.extend(translate_text(text, target_language) for text in pack)
+        pack.clear()
+
+    for text in texts:
+        if pack and pack_chars + len(_SEGMENT_SEPARATOR) + len(text) > _MAX_PACK_CHARS:
+            flush_pack()
+            pack_chars = 0
+        pack.append(text)
+        pack_chars += len(text) + len(_SEGMENT_SEPARATOR)
+    flush_pack()
+
+    return translated
+
+def generate_speech_bytes(text, voice_id='Lotte'):
+    """Generate speech from text using Amazon Polly, returning raw mp3 bytes"""
     try:
-        polly_client = create_boto3_client('polly')
+        cache_key = _cache_key('polly', voice_id, text)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         response = polly_client.synthesize_speech(
             Text=text,
             OutputFormat='mp3',
             VoiceId=voice_id  # 'Lotte' is a Dutch female voice
         )
-        
-        # Save the audio stream to a file
-        with open(output_file, 'wb') as f:
-            f.write(response['AudioStream'].read())
-        
-        return output_file
+        audio_bytes = response['AudioStream'].read()
+        response_cache.set(cache_key, audio_bytes)
+        return audio_bytes
     except Exception as e:
         logger.error(f"Error generating speech: {str(e)}")
         return None
 
+async def _synthesize_all_async(texts, voice_id='Lotte', max_in_flight=32):
+    """Synthesize many texts concurrently over one asyncio event loop
+
+    A single aiobotocore Polly client multiplexes every request over shared
+    connections, so hundreds of in-flight syntheses cost one event loop
+    rather than one thread apiece. The semaphore caps concurrency to stay
+    under service throttling. Returns mp3 bytes (or None) per input text,
+    in order, using the same on-disk cache as the sync path.
+    """
+    session = get_session()
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async with session.create_client('polly') as polly:
+        async def synthesize(text):
+            cache_key = _cache_key('polly', voice_id, text)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            try:
+                async with semaphore:
+                    response = await polly.synthesize_speech(
+                        Text=text,
+                        OutputFormat='mp3',
+                        VoiceId=voice_id
+                    )
+                    async with response['AudioStream'] as stream:
+                        audio_bytes = await stream.read()
+                response_cache.set(cache_key, audio_bytes)
+                return audio_bytes
+            except Exception as e:
+                logger.error(f"Error generating speech: {str(e)}")
+                return None
+
+        return await asyncio.gather(*[synthesize(text) for text in texts])
+
+def generate_speech(text, output_file, voice_id='Lotte'):
+    """Generate speech from text using Amazon Polly"""
+    audio_bytes = generate_speech_bytes(text, voice_id)
+    if audio_bytes is None:
+        return None
+
+    # Save the audio stream to a file
+    with open(output_file, 'wb') as f:
+        f.write(audio_bytes)
+
+    return output_file
+
+def mix_segments_with_ffmpeg(segments, total_duration_ms, output_file_path):
+    """Mix speech segments at their start offsets in a single ffmpeg pass
+
+    segments is a list of (start_ms, mp3_path) tuples. One filtergraph delays
+    each input with adelay, mixes them over a silent base track of the full
+    duration, and encodes the mp3 once — all in vectorized C instead of
+    pydub's per-sample Python overlay followed by a separate export pass.
+    """
+    try:
+        command = ['ffmpeg', '-y', '-loglevel', 'error', '-nostdin']
+        for _, mp3_path in segments:
+            command += ['-i', mp3_path]
+
+        filters = [f"aevalsrc=0:d={total_duration_ms / 1000.0}[base]"]
+        labels = ['[base]']
+        for idx, (start_ms, _) in enumerate(segments):
+            filters.append(f"[{idx}]adelay={start_ms}:all=1[a{idx}]")
+            labels.append(f"[a{idx}]")
+        filters.append(
+            ''.join(labels) +
+            f"amix=inputs={len(segments) + 1}:dropout_transition=0:normalize=0"
+        )
+
+        command += [
+            '-filter_complex', ';'.join(filters),
+            '-ac', '2', '-b:a', '128k',
+            output_file_path
+        ]
+        subprocess.run(command, check=True)
+        return os.path.exists(output_file_path)
+    except Exception as e:
+        logger.error(f"Error mixing segments with ffmpeg: {str(e)}")
+        return False
+
+def mix_segments_with_numpy(segments, total_duration_ms, output_file_path):
+    """Mix speech segments into one pre-sized numpy buffer, then encode once
+
+    Instead of pydub's overlay, which re-mixes the whole track through Python
+    for every segment, each mp3 is decoded once and added into a single int16
+    buffer with vectorized int32 arithmetic (clipped to avoid wraparound).
+    The finished PCM is piped to ffmpeg's stdin for a single mp3 encode.
+    """
+    try:
+        first_segment = AudioSegment.from_mp3(segments[0][1])
+        sample_rate = first_segment.frame_rate
+
+        total_samples = int(total_duration_ms * sample_rate / 1000)
+        mix_buffer = np.zeros(total_samples, dtype=np.int32)
+
+        for start_ms, mp3_path in segments:
+            segment = AudioSegment.from_mp3(mp3_path).set_channels(1)
+            if segment.frame_rate != sample_rate:
+                segment = segment.set_frame_rate(sample_rate)
+            samples = np.frombuffer(segment.raw_data, dtype=np.int16)
+
+            start_sample = int(start_ms * sample_rate / 1000)
+            if start_sample >= total_samples:
+                continue
+            end_sample = min(start_sample + len(samples), total_samples)
+            mix_buffer[start_sample:end_sample] += samples[:end_sample - start_sample]
+
+        np.clip(mix_buffer, -32768, 32767, out=mix_buffer)
+        pcm_bytes = mix_buffer.astype(np.int16).tobytes()
+
+        command = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 's16le', '-ar', str(sample_rate), '-ac', '1',
+            '-i', 'pipe:0',
+            '-b:a', '128k',
+            output_file_path
+        ]
+        subprocess.run(command, input=pcm_bytes, check=True)
+        return os.path.exists(output_file_path)
+    except Exception as e:
+        logger.error(f"Error mixing segments with numpy: {str(e)}")
+        return False
+
 def milliseconds_to_time(milliseconds):
     """Convert milliseconds to time format used by pydub"""
     return milliseconds
@@ -126,46 +322,55 @@ def srt_to_dutch_speech(input_bucket, input_srt_key, output_bucket, output_audio
                 logger.error(f"Error parsing SRT file: {str(e)}")
                 return None
             
-            # Create a blank audio segment
+            # Get total duration from the last subtitle end time
             if len(subtitles) > 0:
-                # Get total duration from the last subtitle end time
                 last_subtitle = subtitles[-1]
                 total_duration_ms = last_subtitle.end.ordinal  # End time in milliseconds
-                final_audio = AudioSegment.silent(duration=total_duration_ms)
             else:
                 logger.error("No subtitles found in the SRT file")
                 return None
             
-            # Process each subtitle
-            for idx, subtitle in enumerate(subtitles):
-                subtitle_text = subtitle.text.replace("\n", " ")
-                
-                # Translate subtitle to Dutch
-                dutch_text = translate_text(subtitle_text, 'nl')
-                logger.info(f"Translated: '{subtitle_text}' -> '{dutch_text}'")
-                
-                # Generate speech for this subtitle
-                audio_file = os.path.join(temp_dir, f"speech_{idx}.mp3")
-                if not generate_speech(dutch_text, audio_file):
+            # Stage 1a: translate all subtitles, batching several per request
+            # to amortize Translate round-trip latency
+            subtitle_texts = [subtitle.text.replace("\n", " ") for subtitle in subtitles]
+            dutch_texts = translate_texts(subtitle_texts, 'nl')
+            for original, dutch in zip(subtitle_texts, dutch_texts):
+                logger.info(f"Translated: '{original}' -> '{dutch}'")
+
+            # Stage 1b: fan the syntheses out over one asyncio event loop;
+            # fall back to a thread pool if the async path fails
+            try:
+                speech_results = asyncio.run(_synthesize_all_async(dutch_texts))
+            except Exception as e:
+                logger.warning(f"Async synthesis failed ({e}), falling back to threads")
+                with ThreadPoolExecutor(max_workers=16) as executor:
+                    speech_results = list(executor.map(generate_speech_bytes, dutch_texts))
+
+            # Stage 2: write each segment to disk and mix them all in one
+            # ffmpeg invocation at their subtitle start offsets
+            segments = []
+            for idx, (subtitle, audio_bytes) in enumerate(zip(subtitles, speech_results)):
+                if not audio_bytes:
                     logger.warning(f"Failed to generate speech for subtitle {idx}. Skipping.")
                     continue
-                
-                # Load the generated audio
-                try:
-                    speech_segment = AudioSegment.from_mp3(audio_file)
-                    
-                    # Calculate timing
-                    start_time_ms = subtitle.start.ordinal  # Start time in milliseconds
-                    
-                    # Overlay this audio at the correct timestamp
-                    final_audio = final_audio.overlay(speech_segment, position=start_time_ms)
-                except Exception as e:
-                    logger.error(f"Error processing audio segment {idx}: {str(e)}")
-                    continue
-            
-            # Save the final audio file
+
+                mp3_path = os.path.join(temp_dir, f"speech_{idx}.mp3")
+                with open(mp3_path, 'wb') as f:
+                    f.write(audio_bytes)
+                segments.append((subtitle.start.ordinal, mp3_path))
+
+            if not segments:
+                logger.error("No speech segments were generated")
+                return None
+
             output_file_path = os.path.join(temp_dir, "final_output.mp3")
-            final_audio.export(output_file_path, format="mp3")
+            if not mix_segments_with_ffmpeg(segments, total_duration_ms, output_file_path):
+                # Fall back to mixing in a numpy buffer if the filtergraph
+                # fails (e.g., too many inputs for one command line)
+                logger.warning("ffmpeg mixing failed, falling back to numpy mixing")
+                if not mix_segments_with_numpy(segments, total_duration_ms, output_file_path):
+                    logger.error("Failed to mix speech segments")
+                    return None
             
             # Upload to S3 - make sure we're using actual bucket names, not placeholders
             if not upload_to_s3(output_bucket, output_file_path, output_audio_key):